@@ -13,103 +13,95 @@
 # limitations under the License.ccd
 
 
+import asyncio
+import hashlib
+import logging
 import os
-import json
+import random
+import subprocess
 import time
-import datetime
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
-import vertexai
+from urllib.parse import urlparse
 
-from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
-from google.adk.tools import FunctionTool
-from vertexai.preview.vision_models import ImageGenerationModel
-from google import genai
-from google.genai import types
 from google.cloud import firestore
-from google.cloud import storage
+from google.cloud.storage import transfer_manager
+from google.genai import types
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 
-load_dotenv()
+from .clients import (
+    bucket_id,
+    get_firestore_client,
+    get_genai_client,
+    get_imagen_model,
+    get_storage_client,
+)
+from .firestore_tools import (
+    firestore_batch_storage_tool,
+    firestore_parallel_storage_tool,
+    firestore_reader_tool,
+    firestore_storage_tool,
+)
+
+logger = logging.getLogger(__name__)
 
-project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-bucket_id = os.getenv("GCS_BUCKET_NAME")
-firestore_database_id = os.getenv("FIRESTORE_DATABASE_ID")
+_PROMPTS_DIR = Path(__file__).parent / "prompts"
 
-db = firestore.Client(project=project_id, database=firestore_database_id)
 
+@lru_cache(maxsize=None)
+def _prompt(name: str) -> str:
+    """Loads a prompt file once per process.
 
-def store_data_in_firestore(collection_name: str, document_data: dict, document_id: Optional[str] = None) -> str:
-    """
-    Store data into Firestore collections.
-    Args:
-        collection_name: The Firestore collection name for the data (e.g., 'products', 'ad_campaigns', 'customer_feedback').
-        document_data: The data to be stored as a new document. This should be a JSON-serializable dictionary containing key-value pairs.
-        document_id: Optional: A specific ID for the document. If not provided, Firestore will automatically generate one.
-    Returns:
-        A string message containing the result of the storage operation, including the document ID.
+    Keeping the instruction prose in data files lets it be edited without
+    touching Python, and worker processes share the bytes via the page cache.
     """
-    try:
-        # Validate that document_data is a dictionary and is serializable.
-        if not isinstance(document_data, dict):
-            return "Error: The data to be stored must be in dictionary format."
-        
-        # The check for json.dumps() has been removed.
-        # The Firestore SDK handles the direct writing of Python dictionaries to Firestore documents.
-        # Complex types (like nested lists, custom objects) may require manual serialization to a string before storing.
-        
-        collection_ref = db.collection(collection_name)
+    return (_PROMPTS_DIR / name).read_text()
 
-        if document_id:
-            # If a document ID is specified, use the set() method, which will overwrite any existing document.
-            doc_ref = collection_ref.document(document_id)
-            doc_ref.set(document_data)
-            return f"Data successfully stored in collection '{collection_name}' with document ID '{document_id}'."
-        else:
-            # If no document ID is specified, use the add() method, and Firestore will automatically generate an ID.
-            doc_ref = collection_ref.add(document_data)[1] # add() returns (timestamp, DocumentReference)
-            return f"Data successfully stored in collection '{collection_name}' with auto-generated document ID '{doc_ref.id}'."
 
-    except Exception as e:
-        print(f"An error occurred while storing data to Firestore: {e}")
-        return f"An error occurred while storing data to Firestore: {e}"
+# Firestore-backed cache of generated media, keyed by an exact hash of the
+# prompt and generation parameters. Users iterate on storyboards one scene at
+# a time, so re-running an unchanged prompt returns the stored URI instead of
+# paying the full model latency and cost again.
+_MEDIA_CACHE_COLLECTION = "genmedia_cache"
 
 
-def read_data_from_firestore(collection_name: str, document_id: Optional[str] = None) -> str:
-    """
-    Reads one or more documents from the Firestore database.
-    If a document ID is provided, reads a specific document. Otherwise, reads all documents in the collection.
-    Args:
-        collection_name: The name of the Firestore collection to read from.
-        document_id: Optional; The ID of the specific document to read.
-    Returns:
-        A string message containing the read results (JSON-formatted data or an error message).
-    """
-    try:
-        if document_id:
-            # Read a specific document
-            doc_ref = db.collection(collection_name).document(document_id)
-            doc = doc_ref.get()
-            if doc.exists:
-                return f"Document '{document_id}' found in collection '{collection_name}': {json.dumps(doc.to_dict(), indent=2, ensure_ascii=False)}"
-            else:
-                return f"Document '{document_id}' not found in collection '{collection_name}'."
-        else:
-            # Read all documents in the collection
-            docs = db.collection(collection_name).stream()
-            results = []
-            for doc in docs:
-                results.append({"id": doc.id, "data": doc.to_dict()})
-            
-            if results:
-                return f"Found the following documents in collection '{collection_name}': {json.dumps(results, indent=2, ensure_ascii=False)}"
-            else:
-                return f"No documents found in collection '{collection_name}'."
+def _media_cache_key(model: str, prompt: str, params: str) -> str:
+    return hashlib.sha256(f"{model}|{params}|{prompt}".encode()).hexdigest()[:32]
 
-    except Exception as e:
-        print(f"An error occurred while reading from Firestore: {e}")
-        return f"An error occurred while reading from Firestore: {e}"
+
+def _media_cache_lookup(key: str) -> Optional[str]:
+    """Returns the cached GCS URI for key, or None on miss, expiry or failure."""
+    try:
+        doc = get_firestore_client().collection(_MEDIA_CACHE_COLLECTION).document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        ttl = float(os.getenv("MEDIA_CACHE_TTL_SECONDS", "604800"))
+        created_at = data.get("created_at")
+        # Treat entries past the TTL as misses: the generated object may have
+        # been lifecycle-deleted from the bucket, and the next store refreshes
+        # the entry. A TTL of 0 disables expiry.
+        if ttl and created_at and (datetime.now(timezone.utc) - created_at).total_seconds() > ttl:
+            return None
+        return data.get("uri")
+    except Exception:
+        logger.exception("Media cache lookup failed")
+    return None
+
+
+def _media_cache_store(key: str, prompt: str, uri: str) -> None:
+    """Records a generated URI for key; failures only cost a future cache miss."""
+    try:
+        get_firestore_client().collection(_MEDIA_CACHE_COLLECTION).document(key).set(
+            {"uri": uri, "prompt": prompt, "created_at": firestore.SERVER_TIMESTAMP}
+        )
+    except Exception:
+        logger.exception("Media cache store failed")
 
 
 def generate_image_with_imagen(prompt: str) -> str:
@@ -123,14 +115,16 @@ def generate_image_with_imagen(prompt: str) -> str:
         str: return GCS URI when succeed, otherwise return error message
     """
 
-    vertexai.init(project=project_id, location="us-central1")
-    now = datetime.datetime.now()
-    timestamp_str = now.strftime("%Y-%m-%d_%H-%M-%S")
-    gcs_uri = f"gs://{bucket_id}/images/{timestamp_str}"
+    cache_key = _media_cache_key("imagen-4.0-generate-001", prompt, "16:9")
+    cached_uri = _media_cache_lookup(cache_key)
+    if cached_uri:
+        return cached_uri
 
-    generation_model = ImageGenerationModel.from_pretrained("imagen-4.0-generate-001")
+    # A uuid prefix stays unique under parallel calls, unlike the
+    # second-resolution timestamps used previously.
+    gcs_uri = f"gs://{bucket_id}/images/{uuid.uuid4().hex}"
 
-    operation = generation_model.generate_images(
+    response = get_imagen_model().generate_images(
         prompt=prompt,
         number_of_images=1,
         aspect_ratio="16:9",
@@ -141,30 +135,42 @@ def generate_image_with_imagen(prompt: str) -> str:
         output_gcs_uri=gcs_uri
     )
 
-    return gcs_uri
+    # generate_images is synchronous, so the response already knows the real
+    # object path. Return it instead of the output prefix, which would force
+    # downstream steps to list the bucket to find the actual file.
+    try:
+        image_uri = response.images[0]._gcs_uri
+    except (AttributeError, IndexError):
+        # No image in the response (e.g. safety-filtered): fall back to the
+        # prefix, but don't cache it — it points at no object, and caching it
+        # would pin the failure for the whole TTL instead of retrying.
+        return gcs_uri
 
+    _media_cache_store(cache_key, prompt, image_uri)
+    return image_uri
 
-def generate_video_with_veo(prompt: str, duration_seconds: int) -> str:
+
+async def generate_images_with_imagen(prompts: list[str]) -> list[str]:
     """
-    Generates a video from a text prompt using the Veo model.
+    Generate one image per prompt using Imagen 4, running all generations concurrently.
+    Each generation is an independent remote call, so they are dispatched to
+    worker threads together instead of one after another.
 
     Args:
-        prompt (str): The text description of the video you want to generate.
-        duration_seconds (int): The desired duration of the video in seconds.
+        prompts (list[str]): One text description per image to generate.
 
     Returns:
-        str: The GCS URI of the generated video on success, or an error message on failure.
+        list[str]: The GCS URI (or error message) for each prompt, in the same order.
     """
-    
-    client = genai.Client(
-        vertexai=True, project=project_id, location='us-central1'
-    )
+    return list(await asyncio.gather(
+        *(asyncio.to_thread(generate_image_with_imagen, prompt) for prompt in prompts)
+    ))
 
-    now = datetime.datetime.now()
-    timestamp_str = now.strftime("%Y-%m-%d_%H-%M-%S")
-    gcs_uri = f"gs://{bucket_id}/videos/{timestamp_str}"
 
-    operation = client.models.generate_videos(
+def _submit_veo_job(prompt: str, duration_seconds: int):
+    """Starts a Veo generation and returns the long-running operation."""
+    gcs_uri = f"gs://{bucket_id}/videos/{uuid.uuid4().hex}"
+    return get_genai_client().models.generate_videos(
         model='veo-3.0-generate-001',
         prompt=prompt,
         config=types.GenerateVideosConfig(
@@ -175,43 +181,233 @@ def generate_video_with_veo(prompt: str, duration_seconds: int) -> str:
             output_gcs_uri=gcs_uri,
         ),
     )
-    
+
+
+async def _await_video_operation(operation, max_total_wait: float) -> str:
+    """Polls a Veo operation until it finishes, with jittered exponential backoff.
+
+    Polling starts at 2s and doubles up to VEO_POLL_MAX_INTERVAL seconds
+    (default 15), so short jobs are observed quickly while long jobs don't
+    hammer the operations API. Returns the generated video URI on success,
+    or an error message.
+    """
+    client = get_genai_client()
+    max_poll_interval = float(os.getenv("VEO_POLL_MAX_INTERVAL", "15"))
+    start_time = time.monotonic()
+    delay = 2.0
+    poll_failures = 0
     while not operation.done:
-        time.sleep(15)
+        # Bound the total wait so a stuck operation cannot be polled forever.
+        if time.monotonic() - start_time > max_total_wait:
+            return f"Video generation did not complete within {max_total_wait} seconds."
+        # Jitter the sleep so concurrent scene generations don't poll in lockstep.
+        await asyncio.sleep(random.uniform(0.8, 1.2) * delay)
+        delay = min(delay * 2, max_poll_interval)
         try:
-            operation = client.operations.get(operation)
+            # The genai SDK poll is synchronous; run it off the event loop.
+            operation = await asyncio.to_thread(client.operations.get, operation)
+            poll_failures = 0
         except Exception as e:
-            # An error occurred while polling the operation status.
-            return f"Error while polling operation status: {e}"
-    
+            # A transient poll failure doesn't stop the server-side work, so
+            # retry a few times before giving up on the operation.
+            poll_failures += 1
+            if poll_failures >= 5:
+                return f"Error while polling operation status: {e}"
+
     if operation.error:
-        print(f"Video generation failed.")
         # The operation failed.
+        logger.error("Video generation failed: %s", operation.error.message)
         return f"Operation failed: {operation.error.message}"
-        
+
     if operation.response:
-        video_uri = operation.result.generated_videos[0].video.uri
-        print(f"Video generation succeeded!")
         # The video was generated successfully.
+        video_uri = operation.result.generated_videos[0].video.uri
+        logger.info("Video generation succeeded: %s", video_uri)
         return video_uri
-    
+
     # The operation finished, but the expected response was not received.
     return "Operation complete, but no expected response was received."
 
 
-firestore_storage_tool = FunctionTool(
-    func=store_data_in_firestore
-)
+async def generate_video_with_veo(prompt: str, duration_seconds: int) -> str:
+    """
+    Generates a video from a text prompt using the Veo model.
 
+    The long-running operation is polled asynchronously with exponential backoff
+    (starting at 2s, capped at VEO_POLL_MAX_INTERVAL seconds, default 15), so
+    multiple video generations can run concurrently without blocking a thread.
 
-firestore_reader_tool = FunctionTool(
-    func=read_data_from_firestore
-)
+    Args:
+        prompt (str): The text description of the video you want to generate.
+        duration_seconds (int): The desired duration of the video in seconds.
+
+    Returns:
+        str: The GCS URI of the generated video on success, or an error message on failure.
+    """
+
+    cache_key = _media_cache_key("veo-3.0-generate-001", prompt, str(duration_seconds))
+    cached_uri = await asyncio.to_thread(_media_cache_lookup, cache_key)
+    if cached_uri:
+        return cached_uri
+
+    # The submission RPC itself can take seconds; run it off the event loop
+    # like the polls so concurrent scene generations aren't serialized.
+    operation = await asyncio.to_thread(_submit_veo_job, prompt, duration_seconds)
+    # Veo render time doesn't scale with clip duration, so use the same fixed
+    # configurable bound as await_veo_job rather than duration_seconds * N,
+    # which gave short clips a ceiling tight enough to abort healthy jobs.
+    result = await _await_video_operation(operation, float(os.getenv("VEO_AWAIT_TIMEOUT", "600")))
+
+    if result.startswith("gs://"):
+        await asyncio.to_thread(_media_cache_store, cache_key, prompt, result)
+    return result
+
+
+def submit_veo_job(prompt: str, duration_seconds: int) -> str:
+    """
+    Starts a Veo video generation job without waiting for it to finish.
+    Use this together with await_veo_job when there is other useful work to do
+    while the video renders, instead of blocking inside a single tool call.
+
+    Args:
+        prompt (str): The text description of the video you want to generate.
+        duration_seconds (int): The desired duration of the video in seconds.
+
+    Returns:
+        str: The operation name to pass to await_veo_job to collect the result.
+    """
+    return _submit_veo_job(prompt, duration_seconds).name
+
+
+async def await_veo_job(operation_name: str) -> str:
+    """
+    Waits for a Veo job started with submit_veo_job and returns its result.
+
+    Args:
+        operation_name (str): The operation name returned by submit_veo_job.
+
+    Returns:
+        str: The GCS URI of the generated video on success, or an error message on failure.
+    """
+    operation = types.GenerateVideosOperation(name=operation_name)
+    max_total_wait = float(os.getenv("VEO_AWAIT_TIMEOUT", "600"))
+    return await _await_video_operation(operation, max_total_wait)
+
+
+async def generate_video_scenes(prompts: list[str], duration_seconds: int) -> list[str]:
+    """
+    Generates one video per prompt using the Veo model, running all generations concurrently.
+    The generations are independent long-running operations, so awaiting them
+    together makes the total wall time that of the slowest scene instead of
+    the sum of all scenes.
+
+    Args:
+        prompts (list[str]): One text description per video scene to generate.
+        duration_seconds (int): The desired duration of each video in seconds.
+
+    Returns:
+        list[str]: The GCS URI (or error message) for each prompt, in the same order.
+    """
+    # Veo quota only allows a few generations in flight; an unbounded gather
+    # would trip the rate limit and effectively serialize anyway, so bound the
+    # fan-out. VEO_CONCURRENCY lets operators match it to the project quota.
+    semaphore = asyncio.Semaphore(int(os.getenv("VEO_CONCURRENCY", "2")))
+
+    async def _generate(prompt: str) -> str:
+        async with semaphore:
+            return await generate_video_with_veo(prompt, duration_seconds)
+
+    return list(await asyncio.gather(*(_generate(prompt) for prompt in prompts)))
+
+
+def _parse_gcs(uri: str) -> tuple[str, str]:
+    """Splits a gs:// URI into its bucket name and object name."""
+    parsed = urlparse(uri)
+    return parsed.netloc, parsed.path.lstrip("/")
+
+
+@lru_cache(maxsize=8)
+def _get_bucket(bucket_name: str):
+    """Returns a memoized bucket handle from the shared storage client."""
+    return get_storage_client().bucket(bucket_name)
+
+
+# Below this size a single PUT has less overhead than a composed chunked
+# upload; above it, parallel chunks make better use of the egress bandwidth.
+_CHUNKED_UPLOAD_THRESHOLD = 16 * 1024 * 1024
+
+
+async def generate_thumbnail_and_two_scenes(thumbnail_prompt: str, scene_prompt_1: str, scene_prompt_2: str, duration_seconds: int) -> dict:
+    """
+    Generates the thumbnail image and both video scenes concurrently.
+    The Imagen call finishes in seconds while each Veo scene takes minutes, so
+    running everything together hides the thumbnail latency entirely behind the
+    video generation.
+
+    Args:
+        thumbnail_prompt (str): The text description of the thumbnail image.
+        scene_prompt_1 (str): The text description of the first video scene.
+        scene_prompt_2 (str): The text description of the second video scene.
+        duration_seconds (int): The desired duration of each video in seconds.
+
+    Returns:
+        dict: The keys 'thumbnail_uri', 'scene_1_uri' and 'scene_2_uri', each
+              holding a GCS URI on success or an error message on failure.
+    """
+    thumbnail_uri, scene_uris = await asyncio.gather(
+        asyncio.to_thread(generate_image_with_imagen, thumbnail_prompt),
+        generate_video_scenes([scene_prompt_1, scene_prompt_2], duration_seconds),
+    )
+    return {
+        "thumbnail_uri": thumbnail_uri,
+        "scene_1_uri": scene_uris[0],
+        "scene_2_uri": scene_uris[1],
+    }
+
+
+def _concat_stream_copy(local_file_paths: list[str], output_path: str) -> None:
+    """Concatenates clips with ffmpeg's concat demuxer, copying the streams.
+
+    Veo renders every scene with the same codec, resolution and frame rate, so
+    the packets can be copied byte-for-byte; skipping the decode and x264
+    re-encode turns a CPU-bound merge into a near-instant remux.
+    """
+    list_path = f"{output_path}.txt"
+    with open(list_path, "w") as list_file:
+        for path in local_file_paths:
+            list_file.write(f"file '{path}'\n")
+    subprocess.run(
+        ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", output_path],
+        check=True,
+        capture_output=True,
+    )
+
+
+def _concat_reencode(local_file_paths: list[str], output_path: str) -> None:
+    """Concatenates clips with a MoviePy re-encode, for mismatched inputs."""
+    clips = [VideoFileClip(path) for path in local_file_paths]
+    try:
+        final_clip = concatenate_videoclips(clips)
+        # This is only a fallback, so trade a little quality for encode speed:
+        # ultrafast preset, all cores, and no per-frame progress output, which
+        # otherwise blocks the encode on stdout flushes.
+        final_clip.write_videofile(
+            output_path,
+            codec="libx264",
+            preset="ultrafast",
+            threads=os.cpu_count(),
+            ffmpeg_params=["-crf", "23", "-tune", "fastdecode"],
+            audio_codec="aac",
+            logger=None,
+        )
+    finally:
+        for clip in clips:
+            clip.close()
 
 
 def merge_videos(gcs_video_uri_1: str, gcs_video_uri_2: str) -> str:
     """
-    Downloads two video files from GCS to a local machine, concatenates them using MoviePy, and then uploads the combined video back to GCS.
+    Downloads two video files from GCS to a local machine, concatenates them without re-encoding when possible, and then uploads the combined video back to GCS.
 
     Args:
         gcs_video_uri_1 (str): The GCS URI for the first video
@@ -226,41 +422,50 @@ def merge_videos(gcs_video_uri_1: str, gcs_video_uri_2: str) -> str:
     local_dir = f'/tmp/{uuid.uuid4()}'
     os.makedirs(local_dir, exist_ok=True)
     
-    storage_client = storage.Client()
     local_output_path = None
 
     try:
         # Step 1: download videos to local path
         video_uris = [gcs_video_uri_1, gcs_video_uri_2]
-        local_file_paths = []
 
-        for uri in video_uris:
-            bucket_name, source_blob_name = uri.replace('gs://', '').split('/', 1)
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(source_blob_name)
-            
+        def _download_one(uri: str) -> str:
+            bucket_name, source_blob_name = _parse_gcs(uri)
+            blob = _get_bucket(bucket_name).blob(source_blob_name)
+
             original_filename = os.path.basename(source_blob_name)
             unique_filename = f"{uuid.uuid4()}-{original_filename}"
             local_file_path = os.path.join(local_dir, unique_filename)
             blob.download_to_filename(local_file_path)
-            local_file_paths.append(local_file_path)
+            return local_file_path
 
-        # Step 2: concat videos using MoviePy
-        clip1 = VideoFileClip(local_file_paths[0])
-        clip2 = VideoFileClip(local_file_paths[1])
-        final_clip = concatenate_videoclips([clip1, clip2])
-        
+        # Both transfers are network-bound, so run them concurrently; the
+        # storage client is thread-safe and map() keeps the input order.
+        with ThreadPoolExecutor(max_workers=len(video_uris)) as executor:
+            local_file_paths = list(executor.map(_download_one, video_uris))
+
+        # Step 2: concat videos, preferring stream copy over a re-encode
         output_filename = f"final_{uuid.uuid4()}.mp4"
         local_output_path = os.path.join(local_dir, output_filename)
-        
-        final_clip.write_videofile(local_output_path, codec="libx264")
 
-        # Step 3: upload the result video to GCS
-        output_gcs_uri = f"gs://{bucket_name}/{output_filename}"
-        output_bucket = storage_client.bucket(bucket_name)
-        output_blob = output_bucket.blob(output_filename)
-        
-        output_blob.upload_from_filename(local_output_path)
+        try:
+            _concat_stream_copy(local_file_paths, local_output_path)
+        except (OSError, subprocess.CalledProcessError):
+            # ffmpeg missing or the inputs don't share a codec/resolution;
+            # fall back to the slower decode-and-re-encode path.
+            logger.exception("Stream-copy concat failed, re-encoding with MoviePy")
+            _concat_reencode(local_file_paths, local_output_path)
+
+        # Step 3: upload the result video to GCS, next to the first input clip
+        output_bucket_name, _ = _parse_gcs(gcs_video_uri_1)
+        output_gcs_uri = f"gs://{output_bucket_name}/{output_filename}"
+        output_blob = _get_bucket(output_bucket_name).blob(output_filename)
+
+        if os.path.getsize(local_output_path) > _CHUNKED_UPLOAD_THRESHOLD:
+            transfer_manager.upload_chunks_concurrently(
+                local_output_path, output_blob, chunk_size=8 * 1024 * 1024, max_workers=8
+            )
+        else:
+            output_blob.upload_from_filename(local_output_path)
 
         return output_gcs_uri
         
@@ -268,11 +473,6 @@ def merge_videos(gcs_video_uri_1: str, gcs_video_uri_2: str) -> str:
         return None
     finally:
         # Step 4: clear local temp files
-        if 'clip1' in locals() and clip1:
-            clip1.close()
-        if 'clip2' in locals() and clip2:
-            clip2.close()
-        
         if local_dir and os.path.exists(local_dir):
             import shutil
             shutil.rmtree(local_dir)
@@ -281,61 +481,8 @@ def merge_videos(gcs_video_uri_1: str, gcs_video_uri_2: str) -> str:
 ads_creative_video_agent = LlmAgent(
     model = 'gemini-2.5-pro',
     name='AdsCreativeVideoAgent',
-    instruction="""
-    You're a Creative Advertising Generation Assistant, ready to turn product prompts and descriptions into compelling ad videos.
-    You have the abilities to genearte videos using your available tools.
-    If you're asked to translate into other languages, please do.
-    If anything's unclear, just ask the user for more info.
-    After each step, report your progress to the user and ask if they'd like to proceed to the next step or modify the current one.
-    Here's our workflow:
-    1. Storyboard & Script Creation: Design a 16-second creative ad video storyboard and narration script, divided into two distinct 8-second scenes. Each scene has multiple sequences. Then design a description for thumbnail image. Show storyboard and thumbnail image description to user and change it according to user's feedback.
-    2. Thumbnail Image Generation: Using the thumbnail image description to generate an image.
-    3. Video Scene Generation: Using the storyboard, script, generate two 8-second video clips, one for each scene.
-    4. Final Video Assembly: Combine the generated video clips into one complete final video. Store this video file in the GCS bucket, ensuring the filename includes the keyword "final".ads Once complete, inform the user of the final video's GCS URI.
-    5. Ad Tag Generation: Analyze the final video and generate relevant tags for ad placement. Store these tags as a document in the database.
-
-    When creating storyboard, generate a detailed prompt for the Veo 3 video generation model to create a creative advertisement based on the user-provided product description and labels.
-    The video must include an English voiceover introducing the product.
-    Please be as creative as possible.
-
-    Generated Prompt Sample:
-
-    Metadata:
-    prompt_name: "Product Genesis Commercial"
-    base_style: "cinematic, photorealistic, 4K, dynamic lighting, high-end commercial look"
-    aspect_ratio: "16:9"
-    user_provided_product_description: "[Insert User-Provided Product Description Here]"
-    user_provided_product_tags: "[Insert User-Provided Product Tags Here (e.g., 'eco-friendly', 'tech gadget', 'luxury skincare')]"
-    setting_description: "A sleek, minimalist, abstract environment. Think a high-tech lab or a modern art gallery with soft, focused lighting."
-    product_focus: "The product, as described by the user, is the central hero of the video."
-    negative_prompts: ["blurry footage", "shaky camera", "distracting background characters", "cheesy music", "watermarks"]
-
-    timeline:
-
-    sequence: 1
-    timestamp: "00:00-00:03"
-    action: "A slow-motion shot of abstract elements, inspired by the user_provided_product_tags, swirling elegantly in a dark, void-like space. For 'eco-friendly', this could be glowing leaves and water droplets. For 'tech gadget', it could be circuits of light and geometric shapes."
-    audio: "An ethereal, ambient soundscape with a low, building hum. A calm, confident English voiceover begins, speaking a line derived from the core problem the product solves, based on its description."
-
-    sequence: 2
-    timestamp: "00:03-00:06"
-    action: "The swirling elements dramatically coalesce and morph, seamlessly forming the final product in a flash of brilliant, clean light. The camera executes a dynamic, slow orbital shot around the perfectly rendered product, highlighting its key features mentioned in the user_provided_product_description."
-    audio: "The ambient hum resolves into a single, satisfying, resonant tone as the product forms. The English voiceover continues, introducing the product by name and stating its main function or benefit."
-
-    sequence: 3
-    timestamp: "00:06-00:08"
-    action: "The product rests serenely in the center of the frame as the orbital shot concludes. A soft, elegant light emanates from it, subtly illuminating the minimalist environment. The final shot is clean, aspirational, and focused entirely on the product."
-    audio: "The single tone fades into a soft, pleasant silence or a gentle, uplifting musical sting. The English voiceover delivers the final tagline or call to action from the user_provided_product_description. A lady's voice 'IKEA, makes life better'"
-    )
-
-
-    When generate tags for final video, analyze the video and generate three distinct categories of ad tags:
-    Content Tags: Describe the visible objects, people, and locations (e.g., 'car', 'city street', 'young professionals').
-    Emotional/Thematic Tags: Capture the video's mood and underlying message (e.g., 'thrilling', 'nostalgic', 'friendship', 'determination').
-    Stylistic Tags: Describe the visual and auditory aesthetic (e.g., 'vintage film look', 'high-energy music', 'fast-paced editing').
-    Please provide a list of 5-10 tags for each category based on the video's content.
-    """,
-    tools = [generate_image_with_imagen, generate_video_with_veo, merge_videos, firestore_storage_tool, firestore_reader_tool]
+    instruction=_prompt("ads_creative_video.txt"),
+    tools = [generate_image_with_imagen, generate_images_with_imagen, generate_video_with_veo, generate_video_scenes, generate_thumbnail_and_two_scenes, submit_veo_job, await_veo_job, merge_videos, firestore_storage_tool, firestore_batch_storage_tool, firestore_parallel_storage_tool, firestore_reader_tool]
 )
 
 
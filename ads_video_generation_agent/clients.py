@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide Google Cloud clients shared by the agent modules.
+
+Each factory is memoized with functools.lru_cache so every importer gets the
+same instance, and a client is only constructed the first time a tool actually
+needs it instead of at import time.
+"""
+
+import os
+from functools import lru_cache
+
+import requests
+import vertexai
+from dotenv import load_dotenv
+from google import genai
+from google.cloud import firestore
+from google.cloud import storage
+from vertexai.preview.vision_models import ImageGenerationModel
+
+load_dotenv()
+
+project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+bucket_id = os.getenv("GCS_BUCKET_NAME")
+firestore_database_id = os.getenv("FIRESTORE_DATABASE_ID")
+
+
+@lru_cache(maxsize=1)
+def get_firestore_client() -> firestore.Client:
+    """Returns the shared Firestore client."""
+    return firestore.Client(project=project_id, database=firestore_database_id)
+
+
+@lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """Returns the shared google-genai client backed by Vertex AI."""
+    return genai.Client(
+        vertexai=True, project=project_id, location='us-central1'
+    )
+
+
+@lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Returns the shared Cloud Storage client with a pooled HTTP transport."""
+    client = storage.Client(project=project_id)
+    # Video downloads/uploads run in parallel, so widen the connection pool
+    # beyond the requests default so concurrent transfers reuse sockets
+    # instead of re-handshaking TLS.
+    client._http.mount(
+        "https://",
+        requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=20),
+    )
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_imagen_model() -> ImageGenerationModel:
+    """Returns the shared Imagen model handle, initializing Vertex AI once."""
+    vertexai.init(project=project_id, location="us-central1")
+    return ImageGenerationModel.from_pretrained("imagen-4.0-generate-001")
@@ -0,0 +1,339 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Firestore storage and reader tools shared by the agent modules."""
+
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from google.api_core import retry as api_retry
+from google.api_core.exceptions import Aborted, DeadlineExceeded, GoogleAPICallError, ServiceUnavailable
+from google.adk.tools import FunctionTool
+
+from .clients import get_firestore_client
+
+logger = logging.getLogger(__name__)
+
+# Retry transient Firestore failures inside the SDK call itself; without an
+# explicit policy a stray 503 surfaces as an error string to the LLM, which
+# then retries at the cost of a whole model round trip.
+_RETRY = api_retry.Retry(
+    initial=0.5,
+    maximum=8.0,
+    multiplier=2.0,
+    deadline=30.0,
+    predicate=api_retry.if_exception_type(ServiceUnavailable, Aborted, DeadlineExceeded),
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Serializes obj to compact JSON, using orjson when it is installed.
+
+    default=str covers the non-JSON types Firestore documents carry, such as
+    DatetimeWithNanoseconds timestamps and document references.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+def store_data_in_firestore(collection_name: str, document_data: dict, document_id: Optional[str] = None) -> str:
+    """
+    Store data into Firestore collections.
+    Args:
+        collection_name: The Firestore collection name for the data (e.g., 'products', 'ad_campaigns', 'customer_feedback').
+        document_data: The data to be stored as a new document. This should be a JSON-serializable dictionary containing key-value pairs.
+        document_id: Optional: A specific ID for the document. If not provided, Firestore will automatically generate one.
+    Returns:
+        A string message containing the result of the storage operation, including the document ID.
+    """
+    try:
+        # Validate the payload shape before any RPC, like the batched and
+        # parallel variants do; the SDK raises client-side TypeError/AttributeError
+        # for non-mapping input, which would escape the GoogleAPICallError handler.
+        if not isinstance(document_data, dict):
+            return "Error: The document to be stored must be a dictionary."
+        if not document_data:
+            return "Error: The document to be stored is empty."
+
+        db = get_firestore_client()
+        collection_ref = db.collection(collection_name)
+
+        if document_id:
+            # If a document ID is specified, use the set() method, which will overwrite any existing document.
+            doc_ref = collection_ref.document(document_id)
+            doc_ref.set(document_data, retry=_RETRY, timeout=15.0)
+            _read_cache_invalidate(collection_name, document_id)
+            return f"Data successfully stored in collection '{collection_name}' with document ID '{document_id}'."
+        else:
+            # If no document ID is specified, generate one client-side. document()
+            # with no arguments mints a random ID locally, so set() is a single
+            # write RPC, whereas add() waits on a server round trip for the ID.
+            doc_ref = collection_ref.document()
+            doc_ref.set(document_data, retry=_RETRY, timeout=15.0)
+            return f"Data successfully stored in collection '{collection_name}' with auto-generated document ID '{doc_ref.id}'."
+
+    except GoogleAPICallError as e:
+        logger.exception("Storing data to Firestore failed")
+        return f"An error occurred while storing data to Firestore: {e}"
+
+
+def store_many_in_firestore(collection_name: str, documents: list[dict], ids: Optional[list[str]] = None) -> str:
+    """
+    Store multiple documents into a Firestore collection using batched writes.
+    Batching commits the documents in a few round trips instead of one RPC per
+    document, so prefer this over repeated single-document writes.
+    Args:
+        collection_name: The Firestore collection name for the data (e.g., 'products', 'ad_campaigns', 'ad_tags').
+        documents: The documents to be stored. Each should be a JSON-serializable dictionary of key-value pairs.
+        ids: Optional; Specific document IDs, one per document. Documents with an ID are overwritten in place; without one, Firestore generates an ID.
+    Returns:
+        A string message containing the result of the storage operation, including the document IDs.
+    """
+    try:
+        if not isinstance(documents, list) or not all(isinstance(d, dict) for d in documents):
+            return "Error: The data to be stored must be a list of dictionaries."
+        if ids is not None and len(ids) != len(documents):
+            return "Error: When document IDs are provided, there must be exactly one per document."
+
+        db = get_firestore_client()
+        collection_ref = db.collection(collection_name)
+        document_ids = []
+
+        # Firestore accepts at most 500 writes per commit, so chunk the input.
+        for start in range(0, len(documents), 500):
+            batch = db.batch()
+            for offset, document_data in enumerate(documents[start:start + 500]):
+                document_id = ids[start + offset] if ids else None
+                doc_ref = collection_ref.document(document_id) if document_id else collection_ref.document()
+                batch.set(doc_ref, document_data)
+                if document_id:
+                    _read_cache_invalidate(collection_name, document_id)
+                document_ids.append(doc_ref.id)
+            batch.commit(retry=_RETRY, timeout=15.0)
+
+        return (f"{len(document_ids)} documents successfully stored in collection "
+                f"'{collection_name}' with document IDs {document_ids}.")
+
+    except GoogleAPICallError as e:
+        logger.exception("Storing data to Firestore failed")
+        return f"An error occurred while storing data to Firestore: {e}"
+
+
+# In-memory TTL cache for single-document reads. The workflow re-reads the
+# same product/tag documents across steps, so hot entries skip the Firestore
+# round trip entirely until they expire or are overwritten.
+_READ_CACHE: dict = {}
+_READ_CACHE_TTL = 60.0
+_READ_CACHE_MAX = 1024
+
+
+def _read_cache_get(collection_name: str, document_id: str) -> Optional[str]:
+    entry = _READ_CACHE.get((collection_name, document_id))
+    if entry and time.monotonic() - entry[0] < _READ_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _read_cache_put(collection_name: str, document_id: str, payload: str) -> None:
+    if len(_READ_CACHE) >= _READ_CACHE_MAX:
+        _READ_CACHE.clear()
+    _READ_CACHE[(collection_name, document_id)] = (time.monotonic(), payload)
+
+
+def _read_cache_invalidate(collection_name: str, document_id: str) -> None:
+    _READ_CACHE.pop((collection_name, document_id), None)
+
+
+_WRITE_POOL = ThreadPoolExecutor(max_workers=10)
+
+
+def _write_document_with_retry(collection_name: str, document_data: dict, document_id: Optional[str] = None, attempts: int = 3) -> str:
+    """Writes one document, retrying transient Firestore failures with backoff."""
+    delay = 0.5
+    for attempt in range(attempts):
+        try:
+            collection_ref = get_firestore_client().collection(collection_name)
+            if document_id:
+                collection_ref.document(document_id).set(document_data, retry=_RETRY, timeout=15.0)
+                _read_cache_invalidate(collection_name, document_id)
+                return document_id
+            # Client-side auto ID: one write RPC instead of add()'s extra round trip.
+            doc_ref = collection_ref.document()
+            doc_ref.set(document_data, retry=_RETRY, timeout=15.0)
+            return doc_ref.id
+        except (Aborted, DeadlineExceeded):
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def store_documents_in_firestore(documents: list[dict]) -> str:
+    """
+    Store multiple documents, possibly across different collections, in parallel.
+    Each write is dominated by round-trip latency, so the writes are submitted
+    to a thread pool and run concurrently instead of one after another.
+    Args:
+        documents: A list of write requests. Each item is a dictionary with keys
+            'collection_name' (the target collection), 'document_data' (the document
+            to store as a dictionary), and optionally 'document_id'.
+    Returns:
+        A string message containing the result of each write operation.
+    """
+    try:
+        if not isinstance(documents, list) or not all(isinstance(d, dict) for d in documents):
+            return "Error: The write requests must be a list of dictionaries."
+        if not all("collection_name" in d and "document_data" in d for d in documents):
+            return "Error: Each write request needs 'collection_name' and 'document_data' keys."
+
+        futures = {}
+        for item in documents:
+            future = _WRITE_POOL.submit(
+                _write_document_with_retry,
+                item["collection_name"],
+                item["document_data"],
+                item.get("document_id"),
+            )
+            futures[future] = item["collection_name"]
+
+        results = []
+        for future in as_completed(futures):
+            collection_name = futures[future]
+            try:
+                document_id = future.result()
+                results.append(f"Stored document '{document_id}' in collection '{collection_name}'.")
+            except Exception as e:
+                results.append(f"Failed to store a document in collection '{collection_name}': {e}")
+
+        return " ".join(results)
+
+    except GoogleAPICallError as e:
+        logger.exception("Storing data to Firestore failed")
+        return f"An error occurred while storing data to Firestore: {e}"
+
+
+def read_data_from_firestore(collection_name: str, document_id: Optional[str] = None, limit: int = 50, page_token: Optional[str] = None, fields: Optional[list[str]] = None) -> str:
+    """
+    Reads one or more documents from the Firestore database.
+    If a document ID is provided, reads a specific document. Otherwise, reads a
+    page of documents in the collection, bounding memory and latency regardless
+    of collection size.
+    Args:
+        collection_name: The name of the Firestore collection to read from.
+        document_id: Optional; The ID of the specific document to read.
+        limit: Maximum number of documents to return for a collection read.
+        page_token: Optional; The document ID returned by a previous page, to continue reading after it.
+        fields: Optional; Only return these fields of each document, reducing payload size.
+    Returns:
+        For collection reads, a JSON object with 'items' and, when another page
+        may follow, 'next_page_token'. Otherwise a string message with the
+        document data or an error.
+    """
+    try:
+        db = get_firestore_client()
+        if document_id:
+            # Read a specific document, serving repeated reads from the TTL cache.
+            cached = _read_cache_get(collection_name, document_id)
+            if cached is not None:
+                return cached
+
+            doc_ref = db.collection(collection_name).document(document_id)
+            doc = doc_ref.get(retry=_RETRY, timeout=15.0)
+            if doc.exists:
+                message = f"Document '{document_id}' found in collection '{collection_name}': {_dumps(doc.to_dict())}"
+                _read_cache_put(collection_name, document_id, message)
+                return message
+            else:
+                return f"Document '{document_id}' not found in collection '{collection_name}'."
+        else:
+            # Read one bounded page of the collection instead of streaming it whole.
+            query = db.collection(collection_name)
+            if fields:
+                query = query.select(fields)
+            query = query.order_by("__name__").limit(limit)
+            if page_token:
+                query = query.start_after({"__name__": db.collection(collection_name).document(page_token)})
+
+            # Serialize each document as it streams in rather than materializing
+            # the whole page as a list of dicts and dumping it in a second pass.
+            # The payload feeds straight into the LLM prompt, so bound its size
+            # as well as its document count; a page of large documents is cut
+            # off early and the cursor lets the caller continue from there.
+            max_chars = int(os.getenv("FIRESTORE_READ_MAX_CHARS", "8000"))
+
+            buffer = io.StringIO()
+            buffer.write('{"collection":')
+            buffer.write(_dumps(collection_name))
+            buffer.write(',"items":[')
+            count = 0
+            truncated = False
+            last_doc_id = None
+            for doc in query.stream(retry=_RETRY, timeout=15.0):
+                if count:
+                    buffer.write(",")
+                buffer.write(_dumps({"id": doc.id, "data": doc.to_dict()}))
+                last_doc_id = doc.id
+                count += 1
+                if buffer.tell() >= max_chars:
+                    truncated = True
+                    break
+            buffer.write("]")
+
+            if count == 0:
+                return f"No documents found in collection '{collection_name}'."
+
+            # A full or truncated page may have more documents behind it;
+            # expose the cursor so the next call resumes after the last one.
+            if truncated or count == limit:
+                buffer.write(',"next_page_token":')
+                buffer.write(_dumps(last_doc_id))
+            if truncated:
+                buffer.write(',"truncated":true')
+            buffer.write("}")
+            return buffer.getvalue()
+
+    except GoogleAPICallError as e:
+        logger.exception("Reading from Firestore failed")
+        return f"An error occurred while reading from Firestore: {e}"
+
+
+firestore_storage_tool = FunctionTool(
+    func=store_data_in_firestore
+)
+
+
+firestore_batch_storage_tool = FunctionTool(
+    func=store_many_in_firestore
+)
+
+
+firestore_parallel_storage_tool = FunctionTool(
+    func=store_documents_in_firestore
+)
+
+
+firestore_reader_tool = FunctionTool(
+    func=read_data_from_firestore
+)